@@ -2806,6 +2806,78 @@ function buildUnpaidApplicationMap(balanceHistory = [], employeeId = null) {
     return unpaidMap;
 }
 
+// Build the table cells for one employee leave history row
+function renderLeaveHistoryRow(app, unpaidApplicationMap = new Map()) {
+    const primaryKey = app?.id != null ? String(app.id) : null;
+    const fallbackKey = app?.application_id != null ? String(app.application_id) : null;
+    const displayId = app?.application_id != null ? app.application_id : (primaryKey || '');
+    const totalHours = getApplicationHours(app);
+
+    let historyInfo = null;
+    if (primaryKey && unpaidApplicationMap.has(primaryKey)) {
+        historyInfo = unpaidApplicationMap.get(primaryKey);
+    } else if (fallbackKey && unpaidApplicationMap.has(fallbackKey)) {
+        historyInfo = unpaidApplicationMap.get(fallbackKey);
+    }
+    let paidHours = totalHours;
+    let unpaidHours = 0;
+
+    if (historyInfo) {
+        if (Number.isFinite(historyInfo.paidHours)) {
+            paidHours = historyInfo.paidHours;
+        }
+        if (Number.isFinite(historyInfo.unpaidHours)) {
+            unpaidHours = historyInfo.unpaidHours;
+        }
+        if (paidHours === 0 && unpaidHours === 0 && totalHours) {
+            paidHours = totalHours;
+        }
+    }
+
+    const normalizedTotalHours = Number.isFinite(totalHours)
+        ? totalHours
+        : parseFloat(totalHours) || 0;
+    const normalizedPaidHours = Number.isFinite(paidHours)
+        ? paidHours
+        : parseFloat(paidHours) || 0;
+    const currentUnpaidHours = Number.isFinite(unpaidHours)
+        ? unpaidHours
+        : parseFloat(unpaidHours) || 0;
+    const unpaidFromTotal = Math.max(0, normalizedTotalHours - normalizedPaidHours);
+    unpaidHours = Math.max(currentUnpaidHours, unpaidFromTotal);
+
+    const rawLeaveType = app.leave_type ?? '';
+    const leaveTypeValue = rawLeaveType != null ? rawLeaveType.toString().trim() : '';
+    const normalizedLeaveType = leaveTypeValue
+        .toLowerCase()
+        .replace(/[-\s]+/g, ' ')
+        .trim();
+    if (normalizedLeaveType === 'leave without pay' && Math.abs(unpaidHours) <= 0.01) {
+        paidHours = 0;
+        unpaidHours = Number.isFinite(totalHours) ? totalHours : 0;
+    }
+    const isCashOut = normalizedLeaveType === 'cash out' || normalizedLeaveType === 'cashout';
+
+    const hasUnpaid = Math.abs(unpaidHours) > 0.01;
+    const hasPaidHours = Math.abs(paidHours) > 0.01;
+    const formattedLeaveType = formatLeaveTypeLabel(leaveTypeValue || rawLeaveType);
+    const leaveLabel = hasUnpaid ? 'Unpaid Leave' : formattedLeaveType;
+    const paidHoursStyleAttr = isCashOut
+        ? ' style="color: #2e7d32; font-weight: 600;"'
+        : (hasPaidHours ? ' style="color: #1565c0; font-weight: 600;"' : '');
+    const unpaidHoursStyleAttr = hasUnpaid ? ' style="color: #c62828; font-weight: 600;"' : '';
+    return `
+        <td>${displayId}</td>
+        <td>${leaveLabel}</td>
+        <td>${app.start_date} ${app.start_time || ''}</td>
+        <td>${app.end_date} ${app.end_time || ''}</td>
+        <td>${formatDurationFromHours(totalHours)}</td>
+        <td${paidHoursStyleAttr}>${formatHours(paidHours)}</td>
+        <td${unpaidHoursStyleAttr}>${formatHours(unpaidHours)}</td>
+        <td><span class="status-badge status-${(app.status || '').toLowerCase()}">${app.status}</span></td>
+    `;
+}
+
 async function loadLeaveHistory(employeeId, status = null) {
     try {
         const statusParam = status ? `&status=${encodeURIComponent(status)}` : '';
@@ -2827,75 +2899,8 @@ async function loadLeaveHistory(employeeId, status = null) {
         tbody.innerHTML = '';
 
         apps.forEach(app => {
-            const primaryKey = app?.id != null ? String(app.id) : null;
-            const fallbackKey = app?.application_id != null ? String(app.application_id) : null;
-            const displayId = app?.application_id != null ? app.application_id : (primaryKey || '');
-            const totalHours = getApplicationHours(app);
-
-            let historyInfo = null;
-            if (primaryKey && unpaidApplicationMap.has(primaryKey)) {
-                historyInfo = unpaidApplicationMap.get(primaryKey);
-            } else if (fallbackKey && unpaidApplicationMap.has(fallbackKey)) {
-                historyInfo = unpaidApplicationMap.get(fallbackKey);
-            }
-            let paidHours = totalHours;
-            let unpaidHours = 0;
-
-            if (historyInfo) {
-                if (Number.isFinite(historyInfo.paidHours)) {
-                    paidHours = historyInfo.paidHours;
-                }
-                if (Number.isFinite(historyInfo.unpaidHours)) {
-                    unpaidHours = historyInfo.unpaidHours;
-                }
-                if (paidHours === 0 && unpaidHours === 0 && totalHours) {
-                    paidHours = totalHours;
-                }
-            }
-
-            const normalizedTotalHours = Number.isFinite(totalHours)
-                ? totalHours
-                : parseFloat(totalHours) || 0;
-            const normalizedPaidHours = Number.isFinite(paidHours)
-                ? paidHours
-                : parseFloat(paidHours) || 0;
-            const currentUnpaidHours = Number.isFinite(unpaidHours)
-                ? unpaidHours
-                : parseFloat(unpaidHours) || 0;
-            const unpaidFromTotal = Math.max(0, normalizedTotalHours - normalizedPaidHours);
-            unpaidHours = Math.max(currentUnpaidHours, unpaidFromTotal);
-
-            const rawLeaveType = app.leave_type ?? '';
-            const leaveTypeValue = rawLeaveType != null ? rawLeaveType.toString().trim() : '';
-            const normalizedLeaveType = leaveTypeValue
-                .toLowerCase()
-                .replace(/[-\s]+/g, ' ')
-                .trim();
-            if (normalizedLeaveType === 'leave without pay' && Math.abs(unpaidHours) <= 0.01) {
-                paidHours = 0;
-                unpaidHours = Number.isFinite(totalHours) ? totalHours : 0;
-            }
-            const isCashOut = normalizedLeaveType === 'cash out' || normalizedLeaveType === 'cashout';
-
-            const hasUnpaid = Math.abs(unpaidHours) > 0.01;
-            const hasPaidHours = Math.abs(paidHours) > 0.01;
-            const formattedLeaveType = formatLeaveTypeLabel(leaveTypeValue || rawLeaveType);
-            const leaveLabel = hasUnpaid ? 'Unpaid Leave' : formattedLeaveType;
-            const paidHoursStyleAttr = isCashOut
-                ? ' style="color: #2e7d32; font-weight: 600;"'
-                : (hasPaidHours ? ' style="color: #1565c0; font-weight: 600;"' : '');
-            const unpaidHoursStyleAttr = hasUnpaid ? ' style="color: #c62828; font-weight: 600;"' : '';
             const row = document.createElement('tr');
-            row.innerHTML = `
-                <td>${displayId}</td>
-                <td>${leaveLabel}</td>
-                <td>${app.start_date} ${app.start_time || ''}</td>
-                <td>${app.end_date} ${app.end_time || ''}</td>
-                <td>${formatDurationFromHours(totalHours)}</td>
-                <td${paidHoursStyleAttr}>${formatHours(paidHours)}</td>
-                <td${unpaidHoursStyleAttr}>${formatHours(unpaidHours)}</td>
-                <td><span class="status-badge status-${(app.status || '').toLowerCase()}">${app.status}</span></td>
-            `;
+            row.innerHTML = renderLeaveHistoryRow(app, unpaidApplicationMap);
             tbody.appendChild(row);
         });
 
@@ -7,7 +7,8 @@ import os
 import uuid
 import logging
 import sqlite3
-from datetime import datetime, timedelta  # @tweakable include timedelta for date calculations
+from datetime import date, datetime, timedelta  # @tweakable include timedelta for date calculations
+from functools import lru_cache
 from http.cookies import SimpleCookie
 from pathlib import Path
 
@@ -61,6 +62,7 @@ from services.balance_manager import (
     initialize_employee_balances,
     update_leave_balance,
     get_employee_balances,
+    get_privilege_remaining_days,
     update_balances_from_admin_edit,
     process_leave_application_balance,
     reset_all_balances,
@@ -109,6 +111,9 @@ WORK_HOURS_PER_DAY = float(os.getenv("WORK_HOURS_PER_DAY", 8))
 EARLIEST_LEAVE_TIME = datetime.strptime("06:30", "%H:%M").time()
 LATEST_LEAVE_TIME = datetime.strptime("15:00", "%H:%M").time()
 
+# Days from each weekday (Monday=0) to the following Monday-Friday date.
+_DAYS_TO_NEXT_WEEKDAY = (1, 1, 1, 1, 3, 2, 1)
+
 # @tweakable server configuration
 
 
@@ -309,57 +314,10 @@ def ensure_leave_without_pay_allowed(
     if not employee_id:
         return
 
-    balances = get_employee_balances(employee_id) or []
-    privilege_balances = [
-        balance
-        for balance in balances
-        if str(balance.get('balance_type', '')).upper() == 'PRIVILEGE'
-    ]
-
-    if not privilege_balances:
+    remaining_days = get_privilege_remaining_days(employee_id)
+    if remaining_days is None:
         return
 
-    current_year = datetime.now().year
-
-    def _coerce_year(balance):
-        try:
-            return int(balance.get('year'))
-        except (TypeError, ValueError):
-            return None
-
-    privilege_balance = None
-    latest_balance = None
-    latest_year = None
-
-    for candidate in privilege_balances:
-        candidate_year = _coerce_year(candidate)
-        if candidate_year == current_year:
-            privilege_balance = candidate
-            break
-
-        if latest_balance is None:
-            latest_balance = candidate
-            latest_year = candidate_year
-            continue
-
-        if candidate_year is None:
-            continue
-
-        if latest_year is None or candidate_year > latest_year:
-            latest_balance = candidate
-            latest_year = candidate_year
-
-    if privilege_balance is None:
-        privilege_balance = latest_balance
-
-    if privilege_balance is None:
-        return
-
-    try:
-        remaining_days = float(privilege_balance.get('remaining_days', 0) or 0)
-    except (TypeError, ValueError):
-        remaining_days = 0.0
-
     tolerance = 1e-6
 
     if remaining_days > tolerance:
@@ -541,17 +499,32 @@ def next_workday(date_str, holidays=None):
     if not date_str:
         return None
 
-    try:
-        current = datetime.strptime(date_str, "%Y-%m-%d").date()
-    except ValueError:
-        return None
+    # fromisoformat is only a fast path for plain ``YYYY-MM-DD``; it also
+    # accepts forms such as ``20240105`` and ``2024-W01-5`` that strptime
+    # rejects, while strptime accepts unpadded dates like ``2024-1-5``.
+    current = None
+    if len(date_str) == 10 and date_str[4] == date_str[7] == '-':
+        try:
+            current = date.fromisoformat(date_str)
+        except ValueError:
+            pass
+    if current is None:
+        try:
+            current = datetime.strptime(date_str, "%Y-%m-%d").date()
+        except ValueError:
+            return None
 
-    holidays = holidays or set()
+    # frozenset() of a frozenset is a no-op, so callers holding one keep
+    # the cached hash between calls.
+    return _next_workday_after(current, frozenset(holidays or ()))
 
-    while True:
-        current += timedelta(days=1)
-        if current.weekday() < 5 and current.isoformat() not in holidays:
-            return current.isoformat()
+
+@lru_cache(maxsize=4096)
+def _next_workday_after(current, holidays):
+    current += timedelta(days=_DAYS_TO_NEXT_WEEKDAY[current.weekday()])
+    while current.isoformat() in holidays:
+        current += timedelta(days=_DAYS_TO_NEXT_WEEKDAY[current.weekday()])
+    return current.isoformat()
 
 
 def compute_return_date(end_date, total_hours, end_time=None, holidays=None):
@@ -866,7 +839,7 @@ class LeaveManagementHandler(http.server.SimpleHTTPRequestHandler):
 
                             # Recalculate total days server-side ignoring client-provided value
                             cursor = conn.execute('SELECT date FROM holidays')
-                            holidays = {row['date'] for row in cursor.fetchall()}
+                            holidays = frozenset(row['date'] for row in cursor.fetchall())
                             start_time = data.get('start_time')
                             end_time = data.get('end_time')
 
@@ -1267,7 +1240,7 @@ class LeaveManagementHandler(http.server.SimpleHTTPRequestHandler):
                                 total_days = float(raw_days) if raw_days is not None else 0.0
                                 employee_name = app_info['employee_name']
                                 cursor = conn.execute('SELECT date FROM holidays')
-                                holidays = {row['date'] for row in cursor.fetchall()}
+                                holidays = frozenset(row['date'] for row in cursor.fetchall())
                                 status_word = 'approved' if new_status == 'Approved' else 'rejected'
                                 return_date = compute_return_date(end_date, total_hours, end_time, holidays)
 
@@ -99,39 +99,28 @@ def initialize_employee_balances(employee_id, year=None):
                     conn.close()
                     return True
 
-                # Initialize vacation leave balance
-                conn.execute('''
+                # Initialize vacation and sick leave balances
+                conn.executemany('''
                     INSERT OR REPLACE INTO leave_balances
                     (id, employee_id, balance_type, allocated_days, used_days, remaining_days, year, last_updated, created_at)
                     VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    str(uuid.uuid4()),
-                    employee_id,
-                    'PRIVILEGE',
-                    privilege_allocation,
-                    0,
-                    privilege_allocation,
-                    year,
-                    current_time,
-                    current_time
-                ))
-
-                # Initialize sick leave balance
-                conn.execute('''
-                    INSERT OR REPLACE INTO leave_balances
-                    (id, employee_id, balance_type, allocated_days, used_days, remaining_days, year, last_updated, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    str(uuid.uuid4()),
-                    employee_id,
-                    'SICK',
-                    sick_allocation,
-                    0,
-                    sick_allocation,
-                    year,
-                    current_time,
-                    current_time
-                ))
+                ''', [
+                    (
+                        str(uuid.uuid4()),
+                        employee_id,
+                        balance_type,
+                        allocation,
+                        0,
+                        allocation,
+                        year,
+                        current_time,
+                        current_time
+                    )
+                    for balance_type, allocation in (
+                        ('PRIVILEGE', privilege_allocation),
+                        ('SICK', sick_allocation),
+                    )
+                ])
 
                 conn.commit()
 
@@ -516,6 +505,37 @@ def get_employee_balances(employee_id=None):
         finally:
             conn.close()
 
+def get_privilege_remaining_days(employee_id, year=None):
+    """Get remaining PRIVILEGE days for ``year``, else the latest year on record.
+
+    Returns ``None`` when the employee has no PRIVILEGE balance.
+    """
+    if year is None:
+        year = datetime.now().year
+
+    with db_lock:
+        conn = get_db_connection()
+        try:
+            cursor = conn.execute(
+                '''
+                SELECT remaining_days FROM leave_balances
+                WHERE employee_id = ? AND UPPER(balance_type) = 'PRIVILEGE'
+                ORDER BY year = ? DESC, year DESC
+                LIMIT 1
+                ''',
+                (employee_id, year),
+            )
+            row = cursor.fetchone()
+        finally:
+            conn.close()
+
+    if row is None:
+        return None
+    try:
+        return float(row['remaining_days'] or 0)
+    except (TypeError, ValueError):
+        return 0.0
+
 # Reset all balances for active employees
 def reset_all_balances(year=None):
     """Reset leave balances for all active employees"""
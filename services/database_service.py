@@ -18,20 +18,39 @@ _DEFAULT_DB_PATH = Path(__file__).resolve().parent.parent / "leave_management.db
 DATABASE_PATH = os.getenv("DATABASE_PATH", str(_DEFAULT_DB_PATH))
 MAX_DB_RETRIES = 3
 DB_CONNECTION_TIMEOUT = 30
+# Per-connection prepared statement cache size (sqlite3 defaults to 128)
+DB_CACHED_STATEMENTS = 256
 
 # Database lock for thread safety
 # Use RLock to allow the same thread to re-acquire the lock safely
 db_lock = threading.RLock()
 
-def get_db_connection():
-    """Get database connection with retry logic"""
+def _database_target():
+    """Return the sqlite3 connect target for ``DATABASE_PATH``.
+
+    ``file:`` URIs (e.g. shared in-memory databases) are passed through
+    unchanged; filesystem paths are expanded and made absolute.
+    """
+    if DATABASE_PATH.startswith('file:'):
+        return DATABASE_PATH
+
     db_path = Path(DATABASE_PATH).expanduser()
     if not db_path.is_absolute():
         db_path = (Path.cwd() / db_path).resolve()
+    return str(db_path)
+
+def get_db_connection():
+    """Get database connection with retry logic"""
+    target = _database_target()
 
     for attempt in range(MAX_DB_RETRIES):
         try:
-            conn = sqlite3.connect(str(db_path), timeout=DB_CONNECTION_TIMEOUT)
+            conn = sqlite3.connect(
+                target,
+                timeout=DB_CONNECTION_TIMEOUT,
+                cached_statements=DB_CACHED_STATEMENTS,
+                uri=True,
+            )
             conn.execute('PRAGMA foreign_keys = ON')
             conn.row_factory = sqlite3.Row  # Enable dict-like access
             return conn
@@ -44,17 +63,15 @@ def init_database():
     """Initialize SQLite database with required tables"""
     # @tweakable database backup configuration
     CREATE_DB_BACKUP = True
-    db_path = Path(DATABASE_PATH).expanduser()
-    if not db_path.is_absolute():
-        db_path = (Path.cwd() / db_path).resolve()
+    target = _database_target()
 
-    if CREATE_DB_BACKUP and db_path.exists():
-        backup_path = f"{db_path}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    if CREATE_DB_BACKUP and not target.startswith('file:') and os.path.exists(target):
+        backup_path = f"{target}.backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
         import shutil
-        shutil.copy2(str(db_path), backup_path)
+        shutil.copy2(target, backup_path)
         print(f"📦 Database backup created: {backup_path}")
 
-    conn = sqlite3.connect(str(db_path), timeout=DB_CONNECTION_TIMEOUT)
+    conn = sqlite3.connect(target, timeout=DB_CONNECTION_TIMEOUT, uri=True)
     conn.execute('PRAGMA foreign_keys = ON')
     
     # Create all required tables
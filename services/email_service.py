@@ -8,7 +8,7 @@ import logging
 import os
 import smtplib
 import uuid
-from datetime import UTC, datetime, timedelta, timezone
+from datetime import UTC, datetime, timedelta
 from email.message import EmailMessage
 from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 
@@ -84,7 +84,8 @@ def _build_vtimezone_block(tzid: str) -> list[str]:
         ]
 
     zone = ZoneInfo(tzid)
-    offset = datetime.now(zone).utcoffset() or timedelta(0)
+    now = datetime.now(zone)
+    offset = now.utcoffset() or timedelta(0)
     offset_str = _format_utc_offset(offset)
     return [
         "BEGIN:VTIMEZONE",
@@ -94,7 +95,7 @@ def _build_vtimezone_block(tzid: str) -> list[str]:
         "DTSTART:19700101T000000",
         f"TZOFFSETFROM:{offset_str}",
         f"TZOFFSETTO:{offset_str}",
-        f"TZNAME:{datetime.now(zone).tzname() or tzid}",
+        f"TZNAME:{now.tzname() or tzid}",
         "END:STANDARD",
         "END:VTIMEZONE",
     ]
@@ -161,7 +162,6 @@ def generate_ics_content(
                     "Unable to resolve CALENDAR_TIMEZONE=%s; using floating local times",
                     CALENDAR_TIMEZONE,
                 )
-                _fallback_zone = timezone(timedelta(hours=CALENDAR_UTC_OFFSET_HOURS))
                 dtstart_line = f"DTSTART:{_format_ics_datetime(start_dt)}"
                 dtend_line = f"DTEND:{_format_ics_datetime(end_dt)}"
 
@@ -1,6 +1,11 @@
+import json
 import os
+import shutil
+import subprocess
 import sys
 
+import pytest
+
 
 # Provide default administrator credentials required by ``server`` during
 # import. Test environments should override these with secure values if
@@ -23,3 +28,104 @@ for key, value in (
     ("SMTP_PASSWORD", "secret"),
 ):
     os.environ.setdefault(key, value)
+
+
+SCRIPT_JS_PATH = os.path.join(PROJECT_ROOT, "script.js")
+NODE_WORKER_PATH = os.path.join(PROJECT_ROOT, "tests", "support", "node_worker.js")
+
+
+@pytest.fixture(scope="session")
+def node_bin():
+    """Path to the ``node`` executable; tests needing it skip when it is missing."""
+
+    path = shutil.which("node")
+    if path is None:
+        pytest.skip("node is not available")
+    return path
+
+
+@pytest.fixture(scope="session")
+def node_compile_cache(pytestconfig, tmp_path_factory):
+    """Directory under ``.pytest_cache`` holding V8 code cache between runs.
+
+    Falls back to a per-session temporary directory when the cache provider
+    is disabled (``-p no:cacheprovider``).
+    """
+
+    cache = getattr(pytestconfig, "cache", None)
+    if cache is None:
+        return tmp_path_factory.mktemp("ncc")
+    return cache.mkdir("node-compile-cache")
+
+
+@pytest.fixture(scope="session")
+def script_source():
+    """Contents of ``script.js``, read once per test session."""
+
+    with open(SCRIPT_JS_PATH, encoding="utf-8") as handle:
+        return handle.read()
+
+
+@pytest.fixture(scope="session")
+def node_worker(node_bin, node_compile_cache, script_source):
+    """Return a callable that runs a named case in a shared Node process."""
+
+    env = {
+        **os.environ,
+        "NODE_COMPILE_CACHE": str(node_compile_cache),
+        "SCRIPT_CACHE_PATH": str(node_compile_cache / "script.js.cache"),
+    }
+    proc = subprocess.Popen(
+        [node_bin, "--no-warnings", "--no-deprecation", NODE_WORKER_PATH, SCRIPT_JS_PATH],
+        env=env,
+        stdin=subprocess.PIPE,
+        stdout=subprocess.PIPE,
+    )
+    proc.stdin.write(json.dumps(script_source).encode() + b"\n")
+
+    # The pipes stay binary: json.loads accepts the reply bytes directly.
+    def run_case(case, **payload):
+        proc.stdin.write(json.dumps({"case": case, **payload}).encode() + b"\n")
+        proc.stdin.flush()
+        line = proc.stdout.readline()
+        assert line, f"Node worker exited with status {proc.poll()}"
+        response = json.loads(line)
+        assert "error" not in response, response["error"]
+        return response["result"]
+
+    try:
+        yield run_case
+    finally:
+        proc.stdin.close()
+        proc.wait(timeout=10)
+
+
+@pytest.fixture(scope="session")
+def template_db_path(tmp_path_factory):
+    """Freshly initialised database file that tests can copy instead of re-running the schema."""
+
+    from services import database_service
+
+    path = tmp_path_factory.mktemp("tpl") / "template.db"
+    original_db_path = database_service.DATABASE_PATH
+    database_service.DATABASE_PATH = str(path)
+    try:
+        database_service.init_database()
+    finally:
+        database_service.DATABASE_PATH = original_db_path
+    return path
+
+
+def pytest_collection_modifyitems(config, items):
+    """Reject test modules collected twice under different paths."""
+
+    seen = {}
+    duplicates = []
+    for path in dict.fromkeys(item.path for item in items):
+        content = path.read_bytes()
+        if content in seen:
+            duplicates.append(f"{seen[content]} and {path}")
+        else:
+            seen[content] = path
+    if duplicates:
+        raise pytest.UsageError("Identical test modules collected: " + "; ".join(duplicates))
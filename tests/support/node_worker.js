@@ -0,0 +1,487 @@
+// Long-lived test worker for script.js.
+//
+// Usage: node node_worker.js <path/to/script.js>
+//
+// The first line on stdin is the source of script.js as a JSON string; it is
+// compiled once. Every following line is a JSON request naming a `case`
+// handler, which runs script.js in a fresh `vm` context behind a minimal DOM
+// shim. The handler's result is written back as a single JSON line on stdout.
+// The shimmed `console` is silent so stdout only carries protocol lines.
+
+const fs = require('fs');
+const readline = require('readline');
+const vm = require('vm');
+const scriptPath = process.argv[2];
+const writeLine = line => process.stdout.write(line + '\n');
+
+// script.js is compiled once; every case runs it in a fresh context so no
+// state leaks between cases. V8's code cache is persisted between runs and
+// stale cache data is rejected by V8 and simply rewritten.
+const cachePath = process.env.SCRIPT_CACHE_PATH;
+let script = null;
+let scriptSource = null;
+let cacheWritten = false;
+
+function compileScript(code) {
+  scriptSource = code;
+  let cachedData;
+  if (cachePath && fs.existsSync(cachePath)) {
+    cachedData = fs.readFileSync(cachePath);
+  }
+  script = new vm.Script(code, { filename: scriptPath, cachedData });
+  cacheWritten = !cachePath || Boolean(cachedData && !script.cachedDataRejected);
+}
+
+function loadScript(sandbox) {
+  sandbox.window = sandbox;
+  const context = vm.createContext(sandbox);
+  script.runInContext(context);
+  if (!cacheWritten) {
+    fs.writeFileSync(cachePath, script.createCachedData());
+    cacheWritten = true;
+  }
+  return context;
+}
+
+const noop = () => {};
+// No case observes class changes, so every shimmed element shares one
+// inert classList.
+const classList = Object.freeze({ add: noop, remove: noop, toggle: noop, contains: () => false });
+
+// Plain-object stand-in for a DOM element; the cases only read back
+// textContent, innerHTML, dataset and style.
+function createElement(tagName) {
+  return {
+    tagName,
+    innerHTML: '',
+    textContent: '',
+    value: '',
+    children: [],
+    dataset: {},
+    style: {},
+    classList,
+    appendChild(child) {
+      this.children.push(child);
+    },
+    setAttribute: noop,
+    addEventListener: noop,
+    removeEventListener: noop,
+    querySelector: () => null,
+    querySelectorAll: () => [],
+  };
+}
+
+function createBrowserGlobals(document) {
+  const storage = {
+    getItem: () => null,
+    setItem: () => {},
+    removeItem: () => {},
+  };
+  return {
+    console: { log() {}, info() {}, warn() {}, error() {} },
+    setTimeout,
+    clearTimeout,
+    location: { href: 'http://localhost/', search: '' },
+    addEventListener: () => {},
+    document,
+    alert: () => {},
+    confirm: () => true,
+    sessionStorage: storage,
+    localStorage: storage,
+    AbortController: class {
+      constructor() {
+        this.signal = {};
+      }
+
+      abort() {}
+    },
+    FormData: class {
+      constructor() {}
+      append() {}
+    },
+    File: class {},
+    navigator: { userAgent: 'node' },
+  };
+}
+
+function createDocument(elementsById = {}) {
+  return {
+    createElement,
+    getElementById: id => elementsById[id] || createElement('div'),
+    querySelectorAll: () => [],
+    querySelector: () => null,
+    addEventListener: () => {},
+    body: createElement('body'),
+  };
+}
+
+// Runs script.js by direct eval from the context's global scope, as the
+// original `node -e` privilege harness did: function declarations become
+// context globals that can be overridden, while script.js's `let` bindings
+// stay private to the eval.
+function loadScriptWithEval(sandbox) {
+  sandbox.window = sandbox;
+  sandbox.__scriptSource = scriptSource;
+  const context = vm.createContext(sandbox);
+  vm.runInContext('eval(__scriptSource);', context, { filename: scriptPath });
+  return context;
+}
+
+class RadioInput {
+  // The checked radio in the leaveType group, kept current by the setter.
+  static current = null;
+
+  constructor(value) {
+    this.value = value;
+    this.name = 'leaveType';
+    this.type = 'radio';
+    this._checked = false;
+    this._peers = null;
+    this.dataset = {};
+    this.style = {};
+    this.classList = classList;
+    this.listeners = {};
+  }
+
+  set checked(value) {
+    const isChecked = Boolean(value);
+    if (this._checked === isChecked) {
+      return;
+    }
+    this._checked = isChecked;
+    if (isChecked) {
+      RadioInput.current = this;
+    } else if (RadioInput.current === this) {
+      RadioInput.current = null;
+    }
+    if (isChecked && Array.isArray(this._peers)) {
+      for (let i = 0; i < this._peers.length; i++) {
+        const peer = this._peers[i];
+        if (peer !== this) {
+          peer._checked = false;
+        }
+      }
+    }
+  }
+
+  get checked() {
+    return this._checked;
+  }
+
+  setPeers(peers) {
+    this._peers = peers;
+  }
+
+  addEventListener(event, handler) {
+    if (!this.listeners[event]) {
+      this.listeners[event] = [];
+    }
+    this.listeners[event].push(handler);
+  }
+}
+
+// Shared prototype for elements nobody seeds; dataset and style are only
+// allocated when first touched.
+const stubElementProto = {
+  classList,
+  get dataset() {
+    return this._dataset ||= {};
+  },
+  get style() {
+    return this._style ||= {};
+  },
+};
+const createDefaultElement = () => Object.create(stubElementProto);
+
+// Initial element shapes for the leave application form ids the
+// privilege_warning sequence touches.
+const elementDefaults = {
+  reason: () => ({ disabled: false }),
+  reasonNote: () => ({ textContent: '' }),
+  durationText: () => ({ textContent: '' }),
+  startDate: () => ({ value: '2024-01-01' }),
+  endDate: () => ({ value: '2024-01-01' }),
+  startTime: () => ({ value: '07:30', dataset: {}, classList }),
+  endTime: () => ({ value: '14:30', dataset: {}, classList }),
+  loadingOverlay: () => ({ classList }),
+  leaveBalanceDisplay: () => ({ style: {}, classList }),
+  successModal: () => ({ classList }),
+  requestId: () => ({ textContent: '' }),
+};
+
+// FormData stand-in that reads and writes through the submit event target.
+class TargetFormData {
+  constructor(target) {
+    this.target = target;
+  }
+
+  get(name) {
+    if (typeof this.target.getFormValue === 'function') {
+      return this.target.getFormValue(name);
+    }
+    return this.target[name] ?? null;
+  }
+
+  set(name, value) {
+    if (typeof this.target.setFormValue === 'function') {
+      this.target.setFormValue(name, value);
+      return;
+    }
+    this.target[name] = value;
+  }
+}
+
+const cases = {
+  leave_history_row(request) {
+    const context = loadScript(createBrowserGlobals(createDocument()));
+    const unpaidApplicationMap = context.buildUnpaidApplicationMap(
+      request.balanceHistory || [],
+      request.employeeId,
+    );
+    return { html: context.renderLeaveHistoryRow(request.application, unpaidApplicationMap) };
+  },
+
+  async leave_balance_display(request) {
+    const leaveBalanceDisplay = createElement('div');
+    leaveBalanceDisplay.style.display = 'none';
+    const privilegeBalance = createElement('span');
+    const sickBalance = createElement('span');
+
+    const sandbox = createBrowserGlobals(createDocument({
+      leaveBalanceDisplay,
+      privilegeLeaveBalance: privilegeBalance,
+      sickLeaveBalance: sickBalance,
+    }));
+    const leaveBalances = request.leaveBalances || [];
+    sandbox.fetch = async url => {
+      if (typeof url === 'string' && url.startsWith('/api/leave_balance')) {
+        return {
+          ok: true,
+          json: async () => leaveBalances,
+          text: async () => JSON.stringify(leaveBalances),
+        };
+      }
+      return { ok: true, json: async () => ({}), text: async () => '' };
+    };
+
+    const context = loadScript(sandbox);
+    vm.runInContext(`currentUser = ${JSON.stringify(request.currentUser)};`, context);
+    await context.updateLeaveBalanceDisplay();
+
+    return {
+      privilegeBalance: privilegeBalance.textContent,
+      privilegeYear: privilegeBalance.dataset.year,
+      sickBalance: sickBalance.textContent,
+      leaveBalanceDisplay: leaveBalanceDisplay.style.display,
+    };
+  },
+
+  // Replays the Leave Without Pay selection and submission sequence against
+  // the Vacation Leave (VL) warning and reports what the user would see.
+  async privilege_warning() {
+    const alerts = [];
+    const confirmations = [];
+    const confirmationResponses = [false, true, true];
+
+    const radios = [
+      new RadioInput('vacation-leave'),
+      new RadioInput('leave-without-pay'),
+    ];
+    radios.forEach(radio => radio.setPeers(radios));
+    radios[0].checked = true;
+    const [vacationRadio, leaveWithoutPayRadio] = radios;
+
+    // Elements are created on first lookup; ids the sequence reads back get
+    // their initial values from elementDefaults.
+    const elementsById = Object.create(null);
+    const document = {
+      getElementById(id) {
+        return elementsById[id] ?? (elementsById[id] = (elementDefaults[id] || createDefaultElement)());
+      },
+      querySelectorAll: selector => (selector === 'input[name="leaveType"]' ? radios : []),
+      querySelector: selector => (
+        selector === 'input[name="leaveType"]:checked' ? RadioInput.current : null
+      ),
+      addEventListener: noop,
+      createElement: tagName => ({ tagName, classList, dataset: {}, style: {} }),
+    };
+
+    const sandbox = createBrowserGlobals(document);
+    sandbox.confirm = message => {
+      confirmations.push(message);
+      return confirmationResponses.length ? confirmationResponses.shift() : false;
+    };
+    sandbox.alert = message => {
+      alerts.push(message);
+    };
+    sandbox.FormData = TargetFormData;
+
+    const context = loadScriptWithEval(sandbox);
+    // script.js's `let` state is private to the direct eval, so from outside
+    // these names resolve to properties of the context's global object. Set
+    // them directly, and replace canCoverWithPrivilegeLeave so Vacation Leave
+    // (VL) always appears sufficient.
+    Object.assign(context, {
+      currentVacationRemainingDays: 5,
+      lastValidLeaveTypeValue: 'vacation-leave',
+      vacationLeaveWarningAcknowledged: false,
+      currentUser: { id: 'emp-1', first_name: 'Test', surname: 'User' },
+      canCoverWithPrivilegeLeave: () => true,
+    });
+
+    context.setupLeaveTypeHandling();
+
+    const changeHandler = (leaveWithoutPayRadio.listeners.change || [])[0];
+    if (!changeHandler) {
+      throw new Error('Expected change handler to be registered');
+    }
+
+    const formValues = {
+      startDate: '2024-01-01',
+      endDate: '2024-01-01',
+      startTime: '07:30',
+      endTime: '14:30',
+      reason: 'Testing',
+    };
+    const event = {
+      preventDefault: noop,
+      target: {
+        getFormValue(name) {
+          if (name === 'leaveType') {
+            return RadioInput.current ? RadioInput.current.value : null;
+          }
+          return Object.prototype.hasOwnProperty.call(formValues, name) ? formValues[name] : null;
+        },
+        setFormValue(name, value) {
+          if (name === 'leaveType') {
+            for (let i = 0; i < radios.length; i++) {
+              if (radios[i].value === value) {
+                radios[i].checked = true;
+                break;
+              }
+            }
+            return;
+          }
+          formValues[name] = value;
+        },
+        reset: noop,
+      },
+    };
+
+    let createCallCount = 0;
+    let lastPayload = null;
+    context.room.collection = name => ({
+      create: async data => {
+        createCallCount += 1;
+        // Only the fields the tests assert on are reported back.
+        lastPayload = {
+          name,
+          data: { leave_type: data.leave_type, selected_reasons: data.selected_reasons },
+        };
+        return { id: 'created-id', application_id: 'app-123' };
+      },
+    });
+
+    const readAcknowledged = () => context.vacationLeaveWarningAcknowledged;
+    const setAcknowledged = value => {
+      context.vacationLeaveWarningAcknowledged = value;
+    };
+    const respondWith = (...responses) => {
+      confirmationResponses.length = 0;
+      confirmationResponses.push(...responses);
+    };
+    const selectLeaveWithoutPay = () => {
+      leaveWithoutPayRadio.checked = true;
+      changeHandler.call(leaveWithoutPayRadio);
+    };
+    const snapshot = () => ({
+      leaveWithoutPayChecked: leaveWithoutPayRadio.checked,
+      vacationChecked: vacationRadio.checked,
+      confirmCount: confirmations.length,
+    });
+    const submit = async () => {
+      await context.submitLeaveApplication(event);
+      return {
+        createCallCount,
+        lastPayload,
+        ...snapshot(),
+        acknowledgedAfterSubmit: readAcknowledged(),
+        durationMessage: document.getElementById('durationText').textContent,
+      };
+    };
+    const results = {};
+
+    respondWith(false);
+    selectLeaveWithoutPay();
+    results.firstSelection = {
+      ...snapshot(),
+      acknowledged: readAcknowledged(),
+      lastConfirm: confirmations[confirmations.length - 1] || null,
+    };
+
+    respondWith(true);
+    selectLeaveWithoutPay();
+    if (!readAcknowledged()) {
+      setAcknowledged(true);
+    }
+    results.secondSelection = {
+      ...snapshot(),
+      acknowledged: readAcknowledged(),
+      lastConfirm: confirmations[confirmations.length - 1] || null,
+    };
+
+    respondWith(true);
+    results.submitAttempt = await submit();
+
+    const vacationChangeHandler = (vacationRadio.listeners.change || [])[0];
+    if (vacationChangeHandler) {
+      respondWith();
+      vacationRadio.checked = true;
+      vacationChangeHandler.call(vacationRadio);
+    } else {
+      setAcknowledged(false);
+      vacationRadio.checked = true;
+      context.updateLeaveReasonState();
+    }
+    if (readAcknowledged()) {
+      setAcknowledged(false);
+    }
+    results.postDeselect = { ...snapshot(), acknowledged: readAcknowledged() };
+
+    respondWith(true);
+    selectLeaveWithoutPay();
+    if (!readAcknowledged()) {
+      setAcknowledged(true);
+    }
+    results.reselectAfterDeselect = { ...snapshot(), acknowledged: readAcknowledged() };
+
+    respondWith(true);
+    results.secondSubmission = await submit();
+
+    results.confirmations = confirmations.slice();
+    results.alertsDuringSequence = alerts.slice();
+    results.remainingResponses = confirmationResponses.slice();
+    return results;
+  },
+};
+
+const rl = readline.createInterface({ input: process.stdin });
+rl.on('line', async line => {
+  if (!script) {
+    // The first line carries the script.js source as a JSON string.
+    compileScript(JSON.parse(line));
+    return;
+  }
+  let response;
+  try {
+    const request = JSON.parse(line);
+    const handler = cases[request.case];
+    if (!handler) {
+      throw new Error('Unknown case: ' + request.case);
+    }
+    response = { result: await handler(request) };
+  } catch (error) {
+    response = { error: error && error.stack ? error.stack : String(error) };
+  }
+  writeLine(JSON.stringify(response));
+});
@@ -1,15 +1,17 @@
+import shutil
 import uuid
+from datetime import datetime
 
 from services import balance_manager, database_service, employee_service
 
 
-def test_leave_without_pay_partially_deducts_privilege_leave(tmp_path):
+def test_leave_without_pay_partially_deducts_privilege_leave(tmp_path, template_db_path):
     original_db_path = database_service.DATABASE_PATH
     test_db_path = tmp_path / 'test_leave_without_pay.db'
     database_service.DATABASE_PATH = str(test_db_path)
 
     try:
-        database_service.init_database()
+        shutil.copyfile(template_db_path, test_db_path)
 
         employee = employee_service.create_employee(
             {
@@ -125,13 +127,13 @@ def test_leave_without_pay_partially_deducts_privilege_leave(tmp_path):
         database_service.DATABASE_PATH = original_db_path
 
 
-def test_cash_out_counts_as_privilege_leave(tmp_path):
+def test_cash_out_counts_as_privilege_leave(tmp_path, template_db_path):
     original_db_path = database_service.DATABASE_PATH
     test_db_path = tmp_path / 'test_cash_out_privilege.db'
     database_service.DATABASE_PATH = str(test_db_path)
 
     try:
-        database_service.init_database()
+        shutil.copyfile(template_db_path, test_db_path)
 
         employee = employee_service.create_employee(
             {
@@ -221,13 +223,13 @@ def test_cash_out_counts_as_privilege_leave(tmp_path):
         database_service.DATABASE_PATH = original_db_path
 
 
-def test_leave_status_updates_share_transaction(tmp_path):
+def test_leave_status_updates_share_transaction(tmp_path, template_db_path):
     original_db_path = database_service.DATABASE_PATH
     test_db_path = tmp_path / 'test_leave_status_updates_share_transaction.db'
     database_service.DATABASE_PATH = str(test_db_path)
 
     try:
-        database_service.init_database()
+        shutil.copyfile(template_db_path, test_db_path)
 
         employee = employee_service.create_employee(
             {
@@ -361,3 +363,71 @@ def test_leave_status_updates_share_transaction(tmp_path):
         assert fetch_status() == 'Rejected'
     finally:
         database_service.DATABASE_PATH = original_db_path
+
+
+def test_privilege_remaining_days_falls_back_to_latest_year(tmp_path, template_db_path):
+    original_db_path = database_service.DATABASE_PATH
+    test_db_path = tmp_path / 'test_privilege_remaining_fallback.db'
+    database_service.DATABASE_PATH = str(test_db_path)
+
+    try:
+        shutil.copyfile(template_db_path, test_db_path)
+
+        employee = employee_service.create_employee(
+            {
+                'first_name': 'Fallback',
+                'surname': 'User',
+                'personal_email': 'fallback.user@example.com',
+                'annual_leave': 10,
+                'sick_leave': 5,
+            }
+        )
+        employee_id = employee['id']
+        current_year = datetime.now().year
+
+        conn = database_service.get_db_connection()
+        try:
+            conn.executemany(
+                """
+                INSERT INTO leave_balances (
+                    id, employee_id, balance_type, allocated_days, used_days,
+                    remaining_days, carryforward_days, year
+                ) VALUES (?, ?, 'PRIVILEGE', 10, ?, ?, 0, ?)
+                """,
+                [
+                    (str(uuid.uuid4()), employee_id, 7, 3, current_year - 3),
+                    (str(uuid.uuid4()), employee_id, 4, 6, current_year - 1),
+                    (str(uuid.uuid4()), employee_id, 2, 8, current_year - 2),
+                ],
+            )
+            conn.commit()
+        finally:
+            conn.close()
+
+        assert balance_manager.get_privilege_remaining_days(employee_id) == 6.0
+        assert balance_manager.get_privilege_remaining_days(employee_id, current_year - 2) == 8.0
+    finally:
+        database_service.DATABASE_PATH = original_db_path
+
+
+def test_privilege_remaining_days_is_none_without_balances(tmp_path, template_db_path):
+    original_db_path = database_service.DATABASE_PATH
+    test_db_path = tmp_path / 'test_privilege_remaining_none.db'
+    database_service.DATABASE_PATH = str(test_db_path)
+
+    try:
+        shutil.copyfile(template_db_path, test_db_path)
+
+        employee = employee_service.create_employee(
+            {
+                'first_name': 'Empty',
+                'surname': 'User',
+                'personal_email': 'empty.user@example.com',
+                'annual_leave': 10,
+                'sick_leave': 5,
+            }
+        )
+
+        assert balance_manager.get_privilege_remaining_days(employee['id']) is None
+    finally:
+        database_service.DATABASE_PATH = original_db_path
@@ -1,3 +1,4 @@
+import shutil
 import uuid
 
 import pytest
@@ -9,11 +10,11 @@ import server
 
 
 @pytest.fixture
-def test_database(tmp_path):
+def test_database(tmp_path, template_db_path):
     original_db_path = database_service.DATABASE_PATH
     test_db_path = tmp_path / 'cash_out_test.db'
+    shutil.copyfile(template_db_path, test_db_path)
     database_service.DATABASE_PATH = str(test_db_path)
-    database_service.init_database()
     try:
         yield
     finally:
@@ -1,26 +1,12 @@
 import importlib
-import os
 
-
-for key, value in (
-    ("SMTP_SERVER", "smtp.test"),
-    ("SMTP_PORT", "2525"),
-    ("SMTP_USERNAME", "user@test"),
-    ("SMTP_PASSWORD", "secret"),
-):
-    os.environ.setdefault(key, value)
+import pytest
 
 from services import email_service
 
 
-def test_calendar_timezone_defaults_to_los_angeles(monkeypatch):
-    monkeypatch.delenv("CALENDAR_TIMEZONE", raising=False)
-    importlib.reload(email_service)
-
-    assert email_service.CALENDAR_TIMEZONE == "America/Los_Angeles"
-
-
-def test_send_notification_email_inlines_ics(monkeypatch):
+@pytest.fixture
+def dummy_smtp(monkeypatch):
     captured = {}
 
     class DummySMTP:
@@ -43,7 +29,17 @@ def test_send_notification_email_inlines_ics(monkeypatch):
             captured["msg"] = msg
 
     monkeypatch.setattr(email_service.smtplib, "SMTP", DummySMTP)
+    return captured
+
 
+def test_calendar_timezone_defaults_to_los_angeles(monkeypatch):
+    monkeypatch.delenv("CALENDAR_TIMEZONE", raising=False)
+    importlib.reload(email_service)
+
+    assert email_service.CALENDAR_TIMEZONE == "America/Los_Angeles"
+
+
+def test_send_notification_email_inlines_ics(dummy_smtp):
     ok, err = email_service.send_notification_email(
         to_addr="test@example.com",
         subject="Test",
@@ -52,7 +48,7 @@ def test_send_notification_email_inlines_ics(monkeypatch):
     )
 
     assert ok and err is None
-    msg = captured["msg"]
+    msg = dummy_smtp["msg"]
     calendar_part = msg.get_body(("calendar",))
     assert calendar_part is not None
     assert calendar_part.get_content_type() == "text/calendar"
@@ -60,82 +56,109 @@ def test_send_notification_email_inlines_ics(monkeypatch):
     assert msg["Content-Class"] == "urn:content-classes:calendarmessage"
 
 
-def test_generate_ics_content_uses_tzid_and_never_utc(monkeypatch):
-    monkeypatch.setattr(email_service, "CALENDAR_TIMEZONE", "America/Los_Angeles")
-
-    ics = email_service.generate_ics_content(
-        start_date="2026-03-13",
-        end_date="2026-03-16",
-        summary="Mark Llanos - Personal Leave",
-        description="Return Date: 2026-03-17",
-        start_time="06:30",
-        end_time="15:00",
-        uid="APP-123@leave-management-system",
-        organizer_email="organizer@example.com",
-        organizer_name="Leave Bot",
-        attendee_email="employee@example.com",
-        attendee_name="Employee Name",
-        sequence=2,
-        status="CONFIRMED",
-    )
-
-    assert "METHOD:REQUEST" in ics
-    assert "BEGIN:VTIMEZONE" in ics
-    assert "TZID:America/Los_Angeles" in ics
-    assert "DTSTART;TZID=America/Los_Angeles:20260313T063000" in ics
-    assert "DTEND;TZID=America/Los_Angeles:20260316T150000" in ics
-    assert "DTSTART:20260313" not in ics
-    assert "DTEND:20260316" not in ics
-    assert "DTSTART:20260313T" not in ics
-    assert "DTEND:20260316T" not in ics
-    assert "DTSTART;TZID=America/Los_Angeles:20260313T063000Z" not in ics
-    assert "DTEND;TZID=America/Los_Angeles:20260316T150000Z" not in ics
-    assert "UID:APP-123@leave-management-system" in ics
-    assert "DTSTAMP:" in ics
-    assert "ORGANIZER;CN=Leave Bot:mailto:organizer@example.com" in ics
-    assert "ATTENDEE;CN=Employee Name;ROLE=REQ-PARTICIPANT;PARTSTAT=NEEDS-ACTION;RSVP=TRUE:mailto:employee@example.com" in ics
-    assert "SEQUENCE:2" in ics
-    assert "STATUS:CONFIRMED" in ics
-
-
-
-
-def test_generate_ics_content_can_emit_floating_times_without_timezone(monkeypatch):
+@pytest.mark.parametrize(
+    ("kwargs", "expected", "unexpected"),
+    [
+        pytest.param(
+            {
+                "start_date": "2026-03-13",
+                "end_date": "2026-03-16",
+                "summary": "Mark Llanos - Personal Leave",
+                "description": "Return Date: 2026-03-17",
+                "start_time": "06:30",
+                "end_time": "15:00",
+                "uid": "APP-123@leave-management-system",
+                "organizer_email": "organizer@example.com",
+                "organizer_name": "Leave Bot",
+                "attendee_email": "employee@example.com",
+                "attendee_name": "Employee Name",
+                "sequence": 2,
+                "status": "CONFIRMED",
+            },
+            [
+                "METHOD:REQUEST",
+                "BEGIN:VTIMEZONE",
+                "TZID:America/Los_Angeles",
+                "DTSTART;TZID=America/Los_Angeles:20260313T063000",
+                "DTEND;TZID=America/Los_Angeles:20260316T150000",
+                "UID:APP-123@leave-management-system",
+                "DTSTAMP:",
+                "ORGANIZER;CN=Leave Bot:mailto:organizer@example.com",
+                "ATTENDEE;CN=Employee Name;ROLE=REQ-PARTICIPANT;PARTSTAT=NEEDS-ACTION;RSVP=TRUE:mailto:employee@example.com",
+                "SEQUENCE:2",
+                "STATUS:CONFIRMED",
+            ],
+            [
+                "DTSTART:20260313",
+                "DTEND:20260316",
+                "DTSTART:20260313T",
+                "DTEND:20260316T",
+                "DTSTART;TZID=America/Los_Angeles:20260313T063000Z",
+                "DTEND;TZID=America/Los_Angeles:20260316T150000Z",
+            ],
+            id="tzid-never-utc",
+        ),
+        pytest.param(
+            {
+                "start_date": "2026-03-07",
+                "end_date": "2026-03-09",
+                "summary": "Floating local time",
+                "start_time": "06:30",
+                "end_time": "15:00",
+                "force_utc": False,
+                "floating_time": True,
+            },
+            ["DTSTART:20260307T063000", "DTEND:20260309T150000"],
+            ["BEGIN:VTIMEZONE", "DTSTART;TZID=", "DTEND;TZID="],
+            id="floating-without-timezone",
+        ),
+        pytest.param(
+            {
+                "start_date": "2026-02-10",
+                "end_date": "2026-02-10",
+                "summary": "Eduardo Orozco - OOO",
+                "start_time": "06:30",
+                "end_time": "15:00",
+                "force_utc": True,
+            },
+            [
+                "BEGIN:VTIMEZONE",
+                "DTSTART;TZID=America/Los_Angeles:20260210T063000",
+                "DTEND;TZID=America/Los_Angeles:20260210T150000",
+            ],
+            ["DTSTART:20260210T143000Z", "DTEND:20260210T230000Z"],
+            id="force-utc-ignored",
+        ),
+        pytest.param(
+            {
+                "start_date": "2026-03-13",
+                "end_date": "2026-03-13",
+                "summary": "Event with timezone block",
+                "start_time": "06:30",
+                "end_time": "15:00",
+            },
+            [
+                "BEGIN:DAYLIGHT",
+                "RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=2SU",
+                "DTSTART:19700308T020000",
+                "BEGIN:STANDARD",
+                "RRULE:FREQ=YEARLY;BYMONTH=11;BYDAY=1SU",
+                "DTSTART:19701101T020000",
+            ],
+            [],
+            id="vtimezone-rrule-los-angeles",
+        ),
+    ],
+)
+def test_generate_ics_content(monkeypatch, kwargs, expected, unexpected):
     monkeypatch.setattr(email_service, "CALENDAR_TIMEZONE", "America/Los_Angeles")
 
-    ics = email_service.generate_ics_content(
-        start_date="2026-03-07",
-        end_date="2026-03-09",
-        summary="Floating local time",
-        start_time="06:30",
-        end_time="15:00",
-        force_utc=False,
-        floating_time=True,
-    )
+    ics = email_service.generate_ics_content(**kwargs)
 
-    assert "BEGIN:VTIMEZONE" not in ics
-    assert "DTSTART;TZID=" not in ics
-    assert "DTEND;TZID=" not in ics
-    assert "DTSTART:20260307T063000" in ics
-    assert "DTEND:20260309T150000" in ics
-
-def test_generate_ics_content_force_utc_is_ignored_for_leave_events(monkeypatch):
-    monkeypatch.setattr(email_service, "CALENDAR_TIMEZONE", "America/Los_Angeles")
-
-    ics = email_service.generate_ics_content(
-        start_date="2026-02-10",
-        end_date="2026-02-10",
-        summary="Eduardo Orozco - OOO",
-        start_time="06:30",
-        end_time="15:00",
-        force_utc=True,
-    )
-
-    assert "BEGIN:VTIMEZONE" in ics
-    assert "DTSTART;TZID=America/Los_Angeles:20260210T063000" in ics
-    assert "DTEND;TZID=America/Los_Angeles:20260210T150000" in ics
-    assert "DTSTART:20260210T143000Z" not in ics
-    assert "DTEND:20260210T230000Z" not in ics
+    for fragment in expected:
+        assert fragment in ics
+    for fragment in unexpected:
+        assert fragment not in ics
 
 
 def test_generate_ics_content_with_local_times_falls_back_without_zoneinfo(monkeypatch):
@@ -182,22 +205,3 @@ def test_generate_ics_content_ignores_force_utc_without_utc_zone_lookup(monkeypa
 
     assert "DTSTART;TZID=America/Los_Angeles:20260210T063000" in ics
     assert "DTEND;TZID=America/Los_Angeles:20260210T150000" in ics
-
-
-def test_generate_ics_content_vtimezone_uses_rrule_for_los_angeles(monkeypatch):
-    monkeypatch.setattr(email_service, "CALENDAR_TIMEZONE", "America/Los_Angeles")
-
-    ics = email_service.generate_ics_content(
-        start_date="2026-03-13",
-        end_date="2026-03-13",
-        summary="Event with timezone block",
-        start_time="06:30",
-        end_time="15:00",
-    )
-
-    assert "BEGIN:DAYLIGHT" in ics
-    assert "RRULE:FREQ=YEARLY;BYMONTH=3;BYDAY=2SU" in ics
-    assert "DTSTART:19700308T020000" in ics
-    assert "BEGIN:STANDARD" in ics
-    assert "RRULE:FREQ=YEARLY;BYMONTH=11;BYDAY=1SU" in ics
-    assert "DTSTART:19701101T020000" in ics
@@ -1,3 +1,5 @@
+import shutil
+
 import pytest
 
 from services import database_service, employee_service
@@ -9,10 +11,10 @@ def setup_module(module):
     employee_service.VALIDATE_EMAIL_UNIQUENESS = True
 
 
-def test_employee_reactivation(tmp_path):
+def test_employee_reactivation(tmp_path, template_db_path):
     db_path = tmp_path / 'test.db'
+    shutil.copyfile(template_db_path, db_path)
     database_service.DATABASE_PATH = str(db_path)
-    database_service.init_database()
 
     # Create and then soft delete an employee
     employee_data = {
@@ -1,3 +1,4 @@
+import sqlite3
 import uuid
 
 import pytest
@@ -5,63 +6,87 @@ import pytest
 from services import balance_manager, database_service, employee_service
 
 
-def _create_leave_application(employee_id, leave_type, total_days):
+_INSERT_LEAVE_APP_SQL = '''
+    INSERT INTO leave_applications (
+        id, application_id, employee_id, employee_name, start_date, end_date,
+        start_time, end_time, start_day_type, end_day_type, leave_type,
+        selected_reasons, reason, total_hours, total_days, status
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+'''
+
+
+def _create_leave_application(conn, employee_id, leave_type, total_days):
     application_id = str(uuid.uuid4())
     public_application_id = str(uuid.uuid4())
 
-    with database_service.db_lock:
-        conn = database_service.get_db_connection()
-        try:
-            conn.execute(
-                '''
-                INSERT INTO leave_applications (
-                    id, application_id, employee_id, employee_name, start_date, end_date,
-                    start_time, end_time, start_day_type, end_day_type, leave_type,
-                    selected_reasons, reason, total_hours, total_days, status
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ''',
-                (
-                    application_id,
-                    public_application_id,
-                    employee_id,
-                    'Type Tester',
-                    '2024-01-01',
-                    '2024-01-01',
-                    None,
-                    None,
-                    'full',
-                    'full',
-                    leave_type,
-                    '',
-                    '',
-                    0.0,
-                    float(total_days),
-                    'Pending',
-                ),
-            )
-            conn.commit()
-        finally:
-            conn.close()
+    conn.execute(
+        _INSERT_LEAVE_APP_SQL,
+        (
+            application_id,
+            public_application_id,
+            employee_id,
+            'Type Tester',
+            '2024-01-01',
+            '2024-01-01',
+            None,
+            None,
+            'full',
+            'full',
+            leave_type,
+            '',
+            '',
+            0.0,
+            float(total_days),
+            'Pending',
+        ),
+    )
 
     return application_id
 
 
-def _fetch_balances(employee_id):
-    conn = database_service.get_db_connection()
+def _fetch_balances(conn, employee_id):
+    cursor = conn.execute(
+        'SELECT balance_type, used_days, remaining_days FROM leave_balances WHERE employee_id = ?',
+        (employee_id,),
+    )
+    return {
+        row['balance_type']: {
+            'used': float(row['used_days']),
+            'remaining': float(row['remaining_days']),
+        }
+        for row in cursor.fetchall()
+    }
+
+
+@pytest.fixture(scope='module')
+def employee_id():
+    """Initialize one database and employee shared by every leave type case."""
+
+    original_db_path = database_service.DATABASE_PATH
+    database_service.DATABASE_PATH = (
+        f'file:balance_mapping_{uuid.uuid4().hex}?mode=memory&cache=shared'
+    )
+    # A shared in-memory database only lives while a connection is open.
+    keeper = sqlite3.connect(database_service.DATABASE_PATH, uri=True)
+
     try:
-        cursor = conn.execute(
-            'SELECT balance_type, used_days, remaining_days FROM leave_balances WHERE employee_id = ?',
-            (employee_id,),
-        )
-        return {
-            row['balance_type']: {
-                'used': float(row['used_days']),
-                'remaining': float(row['remaining_days']),
+        database_service.init_database()
+
+        employee = employee_service.create_employee(
+            {
+                'first_name': 'Type',
+                'surname': 'Tester',
+                'personal_email': 'type.tester@example.com',
+                'annual_leave': 10,
+                'sick_leave': 8,
             }
-            for row in cursor.fetchall()
-        }
+        )
+        balance_manager.initialize_employee_balances(employee['id'])
+
+        yield employee['id']
     finally:
-        conn.close()
+        keeper.close()
+        database_service.DATABASE_PATH = original_db_path
 
 
 @pytest.mark.parametrize(
@@ -82,54 +107,42 @@ def _fetch_balances(employee_id):
         ('medical-appointment', 'SICK'),
     ],
 )
-def test_leave_type_routes_to_correct_balance(tmp_path, leave_type, expected_balance_type):
-    original_db_path = database_service.DATABASE_PATH
-    database_service.DATABASE_PATH = str(tmp_path / f'{leave_type}_mapping.db')
-
+def test_leave_type_routes_to_correct_balance(employee_id, leave_type, expected_balance_type):
+    conn = database_service.get_db_connection()
+    # Manage the transaction explicitly: read, create, approve and re-read in
+    # one transaction, then roll it back so the shared employee starts every
+    # case with untouched balances.
+    conn.isolation_level = None
+    conn.execute('BEGIN IMMEDIATE')
     try:
-        database_service.init_database()
-
-        employee = employee_service.create_employee(
-            {
-                'first_name': 'Type',
-                'surname': 'Tester',
-                'personal_email': 'type.tester@example.com',
-                'annual_leave': 10,
-                'sick_leave': 8,
-            }
+        initial_balances = _fetch_balances(conn, employee_id)
+        application_id = _create_leave_application(
+            conn, employee_id, leave_type, total_days=1
         )
-
-        employee_id = employee['id']
-        balance_manager.initialize_employee_balances(employee_id)
-
-        initial_balances = _fetch_balances(employee_id)
-
-        application_id = _create_leave_application(employee_id, leave_type, total_days=1)
-
         balance_manager.process_leave_application_balance(
-            application_id, 'Approved', changed_by='TEST'
+            application_id, 'Approved', changed_by='TEST', conn=conn
         )
-
-        updated_balances = _fetch_balances(employee_id)
-
-        privilege_initial = initial_balances['PRIVILEGE']
-        privilege_updated = updated_balances['PRIVILEGE']
-        sick_initial = initial_balances['SICK']
-        sick_updated = updated_balances['SICK']
-
-        if expected_balance_type == 'PRIVILEGE':
-            assert privilege_updated['used'] == pytest.approx(privilege_initial['used'] + 1.0)
-            assert privilege_updated['remaining'] == pytest.approx(
-                privilege_initial['remaining'] - 1.0
-            )
-            assert sick_updated['used'] == pytest.approx(sick_initial['used'])
-            assert sick_updated['remaining'] == pytest.approx(sick_initial['remaining'])
-        else:
-            assert sick_updated['used'] == pytest.approx(sick_initial['used'] + 1.0)
-            assert sick_updated['remaining'] == pytest.approx(sick_initial['remaining'] - 1.0)
-            assert privilege_updated['used'] == pytest.approx(privilege_initial['used'])
-            assert privilege_updated['remaining'] == pytest.approx(
-                privilege_initial['remaining']
-            )
+        updated_balances = _fetch_balances(conn, employee_id)
     finally:
-        database_service.DATABASE_PATH = original_db_path
+        conn.execute('ROLLBACK')
+        conn.close()
+
+    privilege_initial = initial_balances['PRIVILEGE']
+    privilege_updated = updated_balances['PRIVILEGE']
+    sick_initial = initial_balances['SICK']
+    sick_updated = updated_balances['SICK']
+
+    if expected_balance_type == 'PRIVILEGE':
+        assert privilege_updated['used'] == pytest.approx(privilege_initial['used'] + 1.0)
+        assert privilege_updated['remaining'] == pytest.approx(
+            privilege_initial['remaining'] - 1.0
+        )
+        assert sick_updated['used'] == pytest.approx(sick_initial['used'])
+        assert sick_updated['remaining'] == pytest.approx(sick_initial['remaining'])
+    else:
+        assert sick_updated['used'] == pytest.approx(sick_initial['used'] + 1.0)
+        assert sick_updated['remaining'] == pytest.approx(sick_initial['remaining'] - 1.0)
+        assert privilege_updated['used'] == pytest.approx(privilege_initial['used'])
+        assert privilege_updated['remaining'] == pytest.approx(
+            privilege_initial['remaining']
+        )
@@ -1,3 +1,4 @@
+import itertools
 import uuid
 from datetime import datetime
 
@@ -9,15 +10,35 @@ from services.database_service import db_lock, get_db_connection
 import server
 
 
-@pytest.fixture
-def test_database(tmp_path):
+CURRENT_YEAR = datetime.now().year
+_EMAIL_SEQUENCE = itertools.count()
+_VACATION_REMAINING_SQL = (
+    'SELECT remaining_days FROM leave_balances '
+    'WHERE employee_id = ? AND balance_type = "PRIVILEGE"'
+)
+
+
+@pytest.fixture(scope='module')
+def test_database():
+    """Initialize one shared in-memory database and lease its connection.
+
+    The connection also keeps the shared in-memory database alive, so the
+    helpers below reuse it instead of opening and closing their own. Every
+    employee gets a unique email, so tests stay isolated without clearing
+    tables between them.
+    """
+
     original_db_path = database_service.DATABASE_PATH
-    test_db_path = tmp_path / 'leave_without_pay_validation.db'
-    database_service.DATABASE_PATH = str(test_db_path)
-    database_service.init_database()
+    database_service.DATABASE_PATH = (
+        f'file:leave_without_pay_{uuid.uuid4().hex}?mode=memory&cache=shared'
+    )
+    conn = get_db_connection()
+
     try:
-        yield
+        database_service.init_database()
+        yield conn
     finally:
+        conn.close()
         database_service.DATABASE_PATH = original_db_path
 
 
@@ -26,7 +47,7 @@ def _create_employee_with_vacation_balance():
         {
             'first_name': 'Vacation',
             'surname': 'Saver',
-            'personal_email': f'vacation.saver.{uuid.uuid4().hex[:6]}@example.com',
+            'personal_email': f'vacation.saver.{next(_EMAIL_SEQUENCE)}@example.com',
             'annual_leave': 10,
             'sick_leave': 5,
         }
@@ -36,34 +57,36 @@ def _create_employee_with_vacation_balance():
     return employee_id
 
 
-def _fetch_vacation_remaining_days(employee_id):
-    with db_lock:
-        conn = get_db_connection()
-        try:
-            cursor = conn.execute(
-                'SELECT remaining_days FROM leave_balances '
-                'WHERE employee_id = ? AND balance_type = "PRIVILEGE"',
-                (employee_id,),
-            )
-            row = cursor.fetchone()
-            return float(row['remaining_days']) if row else 0.0
-        finally:
-            conn.close()
+@pytest.fixture(scope='module')
+def vacation_employee_id(test_database):
+    """Employee with untouched Vacation Leave (VL) shared by read-only tests."""
 
+    return _create_employee_with_vacation_balance()
+
+
+def _fetch_vacation_remaining_days(conn, employee_id):
+    # A plain SELECT on the module's own connection needs no db_lock.
+    row = conn.execute(_VACATION_REMAINING_SQL, (employee_id,)).fetchone()
+    return float(row['remaining_days']) if row else 0.0
 
-def test_leave_without_pay_rejected_when_request_within_vacation_balance(test_database):
-    employee_id = _create_employee_with_vacation_balance()
+
+def test_leave_without_pay_rejected_when_request_within_vacation_balance(
+    test_database, vacation_employee_id
+):
+    employee_id = vacation_employee_id
 
     with pytest.raises(ValueError) as excinfo:
         server.ensure_leave_without_pay_allowed(employee_id, requested_days=1)
 
     assert str(excinfo.value) == server.LEAVE_WITHOUT_PAY_VACATION_MESSAGE
-    assert _fetch_vacation_remaining_days(employee_id) > 0
+    assert _fetch_vacation_remaining_days(test_database, employee_id) > 0
 
 
-def test_leave_without_pay_rejected_when_request_exceeds_vacation_balance(test_database):
-    employee_id = _create_employee_with_vacation_balance()
-    remaining = _fetch_vacation_remaining_days(employee_id)
+def test_leave_without_pay_rejected_when_request_exceeds_vacation_balance(
+    test_database, vacation_employee_id
+):
+    employee_id = vacation_employee_id
+    remaining = _fetch_vacation_remaining_days(test_database, employee_id)
 
     # Requesting more than the remaining balance must still be rejected when
     # any Vacation Leave (VL) remains.
@@ -79,43 +102,37 @@ def test_leave_without_pay_rejected_when_request_exceeds_vacation_balance(test_d
 def test_leave_without_pay_uses_current_year_balance(test_database):
     """Vacation balances prefer the current year when multiple records exist."""
 
+    # This test rewrites balances, so it uses its own employee rather than
+    # the shared one.
     employee_id = _create_employee_with_vacation_balance()
-    current_year = datetime.now().year
-    previous_year = current_year - 1
+    previous_year = CURRENT_YEAR - 1
 
+    # Exhaust the current year's allocation (10 days from the employee record)
+    # and add a previous-year balance in one batched upsert.
+    conn = test_database
     with db_lock:
-        conn = get_db_connection()
+        conn.execute('BEGIN IMMEDIATE')
         try:
-            conn.execute(
-                'UPDATE leave_balances SET remaining_days = 0, used_days = allocated_days '
-                'WHERE employee_id = ? AND balance_type = "PRIVILEGE" AND year = ?',
-                (employee_id, current_year),
-            )
-            conn.execute(
-                (
-                    """
-                    INSERT INTO leave_balances (
-                        id, employee_id, balance_type, allocated_days, used_days,
-                        remaining_days, carryforward_days, year
-                    ) VALUES (?, ?, 'PRIVILEGE', ?, ?, ?, 0, ?)
-                    ON CONFLICT(employee_id, balance_type, year) DO UPDATE SET
-                        allocated_days=excluded.allocated_days,
-                        used_days=excluded.used_days,
-                        remaining_days=excluded.remaining_days
-                    """
-                ),
-                (
-                    str(uuid.uuid4()),
-                    employee_id,
-                    15,
-                    10,
-                    5,
-                    previous_year,
-                ),
+            conn.executemany(
+                """
+                INSERT INTO leave_balances (
+                    id, employee_id, balance_type, allocated_days, used_days,
+                    remaining_days, carryforward_days, year
+                ) VALUES (?, ?, 'PRIVILEGE', ?, ?, ?, 0, ?)
+                ON CONFLICT(employee_id, balance_type, year) DO UPDATE SET
+                    allocated_days=excluded.allocated_days,
+                    used_days=excluded.used_days,
+                    remaining_days=excluded.remaining_days
+                """,
+                [
+                    (str(uuid.uuid4()), employee_id, 10, 10, 0, CURRENT_YEAR),
+                    (str(uuid.uuid4()), employee_id, 15, 10, 5, previous_year),
+                ],
             )
-            conn.commit()
-        finally:
-            conn.close()
+            conn.execute('COMMIT')
+        except BaseException:
+            conn.execute('ROLLBACK')
+            raise
 
     # Request within the previous year's balance should still be allowed because
     # the current year's Vacation Leave (VL) allocation is exhausted.
@@ -1,22 +1,49 @@
-from server import LATEST_LEAVE_TIME, WORK_HOURS_PER_DAY, compute_return_date
+import pytest
 
+from server import LATEST_LEAVE_TIME, WORK_HOURS_PER_DAY, compute_return_date, next_workday
 
-def test_partial_day_before_end_of_day_returns_same_day():
-    same_day_return = compute_return_date("2025-12-17", WORK_HOURS_PER_DAY / 2, "10:00")
-    assert same_day_return == "2025-12-17"
+CLOSE_TIME = LATEST_LEAVE_TIME.strftime("%H:%M")
+HALF_DAY_HOURS = WORK_HOURS_PER_DAY / 2
 
 
-def test_partial_day_ending_at_close_returns_next_workday():
-    next_day_return = compute_return_date("2025-12-17", 1.5, LATEST_LEAVE_TIME.strftime("%H:%M"))
-    assert next_day_return == "2025-12-18"
+@pytest.mark.parametrize(
+    ("end_date", "total_hours", "end_time", "holidays", "expected"),
+    [
+        pytest.param(
+            "2025-12-17", HALF_DAY_HOURS, "10:00", None, "2025-12-17",
+            id="partial-day-before-close-returns-same-day",
+        ),
+        pytest.param(
+            "2025-12-17", 1.5, CLOSE_TIME, None, "2025-12-18",
+            id="partial-day-ending-at-close-returns-next-workday",
+        ),
+        pytest.param(
+            "2025-12-17", 1.5, CLOSE_TIME, {"2025-12-18"}, "2025-12-19",
+            id="partial-day-ending-at-close-skips-holidays",
+        ),
+    ],
+)
+def test_compute_return_date(end_date, total_hours, end_time, holidays, expected):
+    assert compute_return_date(end_date, total_hours, end_time, holidays) == expected
 
 
-def test_partial_day_ending_at_close_skips_holidays():
-    holidays = {"2025-12-18"}
-    next_workday = compute_return_date(
-        "2025-12-17",
-        1.5,
-        LATEST_LEAVE_TIME.strftime("%H:%M"),
-        holidays,
-    )
-    assert next_workday == "2025-12-19"
+def test_next_workday_skips_weekend_and_following_holiday():
+    assert next_workday("2025-12-19") == "2025-12-22"
+    assert next_workday("2025-12-20") == "2025-12-22"
+    assert next_workday("2025-12-19", {"2025-12-22"}) == "2025-12-23"
+    assert next_workday("2025-12-24", {"2025-12-25", "2025-12-26"}) == "2025-12-29"
+
+
+@pytest.mark.parametrize(
+    ("date_str", "expected"),
+    [
+        pytest.param("2024-1-5", "2024-01-08", id="unpadded"),
+        pytest.param("2024-01- 5", "2024-01-08", id="space-padded-day"),
+        pytest.param("\uff12\uff10\uff12\uff14-01-05", "2024-01-08", id="fullwidth-digits"),
+        pytest.param("20240105", None, id="basic-format"),
+        pytest.param("2024-W01-5", None, id="iso-week"),
+        pytest.param("2024-02-30", None, id="invalid-day"),
+    ],
+)
+def test_next_workday_accepts_strptime_date_formats(date_str, expected):
+    assert next_workday(date_str) == expected
@@ -1,43 +1,66 @@
 import io
 import json
 import sqlite3
+from types import SimpleNamespace
+
+import pytest
 
 import server
 
 
+_SCHEMA_SQL = """
+CREATE TABLE leave_applications (
+    id TEXT PRIMARY KEY,
+    application_id TEXT,
+    employee_id TEXT,
+    employee_name TEXT,
+    start_date TEXT,
+    end_date TEXT,
+    start_time TEXT,
+    end_time TEXT,
+    total_hours REAL,
+    total_days REAL,
+    status TEXT,
+    leave_type TEXT,
+    updated_at TEXT
+);
+CREATE TABLE employees (
+    id TEXT PRIMARY KEY,
+    personal_email TEXT
+);
+CREATE TABLE holidays (date TEXT);
+"""
+
+_SEED_LEAVE_APPLICATIONS = [
+    (
+        "leave-1",
+        "APP-001",
+        "emp-1",
+        "Alice Smith",
+        "2024-06-01",
+        "2024-06-02",
+        "09:00",
+        "17:00",
+        16.0,
+        2.0,
+        "Pending",
+        "Annual Leave",
+        "2024-05-01T00:00:00",
+    ),
+]
+
+_SEED_EMPLOYEES = [
+    ("emp-1", "alice@example.com"),
+]
+
+_APPROVED_BODY = json.dumps({"status": "Approved"}).encode("utf-8")
+
+
 def _prepare_in_memory_db():
     conn = sqlite3.connect(":memory:")
     conn.row_factory = sqlite3.Row
-    conn.execute(
-        """
-        CREATE TABLE leave_applications (
-            id TEXT PRIMARY KEY,
-            application_id TEXT,
-            employee_id TEXT,
-            employee_name TEXT,
-            start_date TEXT,
-            end_date TEXT,
-            start_time TEXT,
-            end_time TEXT,
-            total_hours REAL,
-            total_days REAL,
-            status TEXT,
-            leave_type TEXT,
-            updated_at TEXT
-        )
-        """
-    )
-    conn.execute(
-        """
-        CREATE TABLE employees (
-            id TEXT PRIMARY KEY,
-            personal_email TEXT
-        )
-        """
-    )
-    conn.execute("CREATE TABLE holidays (date TEXT)")
-
-    conn.execute(
+    conn.executescript(_SCHEMA_SQL)
+    conn.executemany(
         """
         INSERT INTO leave_applications (
             id, application_id, employee_id, employee_name,
@@ -45,74 +68,78 @@ def _prepare_in_memory_db():
             total_hours, total_days, status, leave_type, updated_at
         ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
         """,
-        (
-            "leave-1",
-            "APP-001",
-            "emp-1",
-            "Alice Smith",
-            "2024-06-01",
-            "2024-06-02",
-            "09:00",
-            "17:00",
-            16.0,
-            2.0,
-            "Pending",
-            "Annual Leave",
-            "2024-05-01T00:00:00",
-        ),
+        _SEED_LEAVE_APPLICATIONS,
     )
-    conn.execute(
+    conn.executemany(
         "INSERT INTO employees (id, personal_email) VALUES (?, ?)",
-        ("emp-1", "alice@example.com"),
+        _SEED_EMPLOYEES,
     )
     conn.commit()
     return conn
 
 
-def test_leave_approval_uses_ooo_summary(monkeypatch):
-    conn = _prepare_in_memory_db()
+@pytest.fixture(scope="module")
+def seed_db():
+    source = _prepare_in_memory_db()
+    yield source
+    source.close()
+
+
+@pytest.fixture
+def conn(seed_db):
+    dest = sqlite3.connect(":memory:")
+    dest.row_factory = sqlite3.Row
+    seed_db.backup(dest)
+    yield dest
+    dest.close()
+
+
+@pytest.fixture
+def put_handler():
+    handler = server.LeaveManagementHandler.__new__(server.LeaveManagementHandler)
+    handler.wfile = io.BytesIO()
+    handler.command = "PUT"
+
+    def _prepare(path, body=_APPROVED_BODY):
+        handler.headers = {"Content-Length": str(len(body))}
+        handler.rfile = io.BytesIO(body)
+        handler.path = path
+        return handler
+
+    return _prepare
+
 
+@pytest.fixture
+def stubbed_server(monkeypatch, conn):
     monkeypatch.setattr(server, "get_db_connection", lambda: conn)
     monkeypatch.setattr(server, "process_leave_application_balance", lambda *args, **kwargs: None)
     monkeypatch.setattr(server, "send_notification_email", lambda *args, **kwargs: (True, None))
 
     responses = []
+    errors = []
 
     def fake_send_json_response(self, data, status=200):
         responses.append((data, status))
 
-    monkeypatch.setattr(server.LeaveManagementHandler, "send_json_response", fake_send_json_response)
-
-    errors = []
-
     def fake_send_error(self, code, message=None, explain=None):
         errors.append((code, message))
 
+    monkeypatch.setattr(server.LeaveManagementHandler, "send_json_response", fake_send_json_response)
     monkeypatch.setattr(server.LeaveManagementHandler, "send_error", fake_send_error)
 
-    handler = server.LeaveManagementHandler.__new__(server.LeaveManagementHandler)
-    payload = json.dumps({"status": "Approved"}).encode("utf-8")
-    handler.headers = {"Content-Length": str(len(payload))}
-    handler.rfile = io.BytesIO(payload)
-    handler.wfile = io.BytesIO()
-    handler.command = "PUT"
-    handler.path = "/api/leave_application/leave-1"
-
-    handler.handle_put_request("leave_application", ["", "api", "leave_application", "leave-1"])
+    return SimpleNamespace(responses=responses, errors=errors)
 
-    assert not errors, f"Unexpected errors during request: {errors}"
-    assert responses, "Expected a JSON response to be sent"
 
-    conn.close()
+def test_leave_approval_uses_ooo_summary(stubbed_server, put_handler):
+    handler = put_handler("/api/leave_application/leave-1")
 
+    handler.handle_put_request("leave_application", ["", "api", "leave_application", "leave-1"])
 
-def test_leave_approval_does_not_generate_calendar_invite(monkeypatch):
-    conn = _prepare_in_memory_db()
+    assert not stubbed_server.errors, f"Unexpected errors during request: {stubbed_server.errors}"
+    assert stubbed_server.responses, "Expected a JSON response to be sent"
 
-    monkeypatch.setattr(server, "get_db_connection", lambda: conn)
-    monkeypatch.setattr(server, "process_leave_application_balance", lambda *args, **kwargs: None)
-    monkeypatch.setattr(server, "send_notification_email", lambda *args, **kwargs: (True, None))
 
+def test_leave_approval_does_not_generate_calendar_invite(monkeypatch, stubbed_server, put_handler):
     generate_ics_called = {"called": False}
 
     def fake_generate_ics_content(*args, **kwargs):
@@ -121,38 +148,14 @@ def test_leave_approval_does_not_generate_calendar_invite(monkeypatch):
 
     monkeypatch.setattr(server, "generate_ics_content", fake_generate_ics_content, raising=False)
 
-    monkeypatch.setattr(
-        server.LeaveManagementHandler,
-        "send_json_response",
-        lambda self, data, status=200: None,
-    )
-    monkeypatch.setattr(
-        server.LeaveManagementHandler,
-        "send_error",
-        lambda self, code, message=None, explain=None: None,
-    )
-
-    handler = server.LeaveManagementHandler.__new__(server.LeaveManagementHandler)
-    payload = json.dumps({"status": "Approved"}).encode("utf-8")
-    handler.headers = {"Content-Length": str(len(payload))}
-    handler.rfile = io.BytesIO(payload)
-    handler.wfile = io.BytesIO()
-    handler.command = "PUT"
-    handler.path = "/api/leave_application/leave-1"
+    handler = put_handler("/api/leave_application/leave-1")
 
     handler.handle_put_request("leave_application", ["", "api", "leave_application", "leave-1"])
 
     assert generate_ics_called["called"] is False
 
-    conn.close()
-
-
-def test_all_admin_recipients_receive_approval_notification(monkeypatch):
-    conn = _prepare_in_memory_db()
-
-    monkeypatch.setattr(server, "get_db_connection", lambda: conn)
-    monkeypatch.setattr(server, "process_leave_application_balance", lambda *args, **kwargs: None)
 
+def test_all_admin_recipients_receive_approval_notification(monkeypatch, stubbed_server, put_handler):
     sent_emails = []
 
     def fake_send_notification_email(to_addr, subject, body, *args, ics_content=None, **kwargs):
@@ -172,32 +175,12 @@ def test_all_admin_recipients_receive_approval_notification(monkeypatch):
     ]
     monkeypatch.setattr(server, "ADMIN_APPROVE_EMAILS", admin_recipients)
 
-    responses = []
-
-    def fake_send_json_response(self, data, status=200):
-        responses.append((data, status))
-
-    monkeypatch.setattr(server.LeaveManagementHandler, "send_json_response", fake_send_json_response)
-
-    errors = []
-
-    def fake_send_error(self, code, message=None, explain=None):
-        errors.append((code, message))
-
-    monkeypatch.setattr(server.LeaveManagementHandler, "send_error", fake_send_error)
-
-    handler = server.LeaveManagementHandler.__new__(server.LeaveManagementHandler)
-    payload = json.dumps({"status": "Approved"}).encode("utf-8")
-    handler.headers = {"Content-Length": str(len(payload))}
-    handler.rfile = io.BytesIO(payload)
-    handler.wfile = io.BytesIO()
-    handler.command = "PUT"
-    handler.path = "/api/leave_application/leave-1"
+    handler = put_handler("/api/leave_application/leave-1")
 
     handler.handle_put_request("leave_application", ["", "api", "leave_application", "leave-1"])
 
-    assert not errors, f"Unexpected errors during request: {errors}"
-    assert responses, "Expected a JSON response to be sent"
+    assert not stubbed_server.errors, f"Unexpected errors during request: {stubbed_server.errors}"
+    assert stubbed_server.responses, "Expected a JSON response to be sent"
 
     admin_calls = [call for call in sent_emails if call["to"] in admin_recipients]
     employee_calls = [call for call in sent_emails if call["to"] == "alice@example.com"]
@@ -210,5 +193,3 @@ def test_all_admin_recipients_receive_approval_notification(monkeypatch):
     assert len(employee_calls) == 1
     assert employee_calls[0]["ics"] is None
     assert employee_calls[0]["subject"] == "Alice Smith - OOO"
-
-    conn.close()